@@ -1,16 +1,64 @@
 import os
 import base64
-import json
+import functools
+import hashlib
+import html
+import pathlib
 import random
-import secrets
+import re
+import tempfile
+import threading
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from io import BytesIO
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
 import urllib.parse
 
+import orjson
+import pandas as pd
 import streamlit as st
 from gtts import gTTS
 from supabase import Client, create_client
 
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+_URLSAFE_B64_TRANS = str.maketrans("-_", "+/")
+_WORDS_PAGE_SIZE = 500
+_WORDS_TABLE_PAGE_SIZE = 50
+_SETS_CACHE_TTL = 30.0
+_WORDS_CACHE_TTL = 300.0
+_DATA_CACHE_MAX_ENTRIES = 256
+_FCR_HISTORY_MAX = 2048
+_CARD_HEADER_TMPL = '<div class="fc-word">{word}</div>'
+_CARD_BODY_TMPL = (
+    '<div class="fc-body">'
+    '<div class="fc-meaning">{meaning}</div>'
+    '<div class="fc-pronunciation">{pronunciation}</div>'
+    '<div class="fc-example">{example}</div>'
+    "</div>"
+)
+_TTS_BUCKET = "tts-cache"
+# 키가 (단어, 언어) 해시라서 내용이 바뀌지 않으므로 오래 캐시해도 된다
+_TTS_CACHE_CONTROL = str(365 * 86400)
+_TTS_DISK_DIR = pathlib.Path(__file__).parent / ".tts_cache"
+_TTS_DISK_TTL = 30 * 86400
+_TTS_DISK_MAX_FILES = 5000
+_TTS_DISK_PRUNE_INTERVAL = 600
+_TTS_DISK_TMP_TTL = 3600
+_WORD_TABLE_COLUMNS = ["word", "meaning", "pronunciation", "example", "created_at"]
+_WORD_TABLE_LABELS = {
+    "word": "단어",
+    "meaning": "의미",
+    "pronunciation": "발음",
+    "example": "예문",
+    "created_at": "추가일",
+}
+
+# 한글 / 가나 / 한자 중 처음 나오는 문자로 발음 언어를 추정한다
+_TTS_LANG_RE = re.compile("([\uac00-\ud7a3])|([\u3040-\u309f\u30a0-\u30ff])|([\u4e00-\u9fff])")
+_TTS_LANG_BY_GROUP = {1: "ko", 2: "ja", 3: "zh-CN"}
+
 
 def _get_secret(name: str) -> Optional[str]:
     value = os.getenv(name)
@@ -31,16 +79,24 @@ def _get_supabase_config() -> Tuple[str, str]:
     return url, key
 
 
+@st.cache_resource(show_spinner=False, max_entries=128)
+def _get_raw_client(url: str, key: str, access_token: str, refresh_token: str) -> Client:
+    client = create_client(url, key)
+    client.auth.set_session(access_token, refresh_token)
+    return client
+
+
 def _create_client(session: Optional[Dict[str, Any]]) -> Client:
     url, key = _get_supabase_config()
-    client = create_client(url, key)
     if session and session.get("access_token") and session.get("refresh_token"):
         try:
-            client.auth.set_session(session["access_token"], session["refresh_token"])
+            return _get_raw_client(url, key, session["access_token"], session["refresh_token"])
         except Exception:
             st.session_state.pop("sb_session", None)
+            st.session_state.pop("_user_cached", None)
             st.rerun()
-    return client
+    # 로그인/회원가입용 클라이언트는 세션이 설정되므로 사용자 간에 공유하지 않는다
+    return create_client(url, key)
 
 
 def _to_error_message(err: Any) -> str:
@@ -55,17 +111,27 @@ def _to_error_message(err: Any) -> str:
 
 
 def _execute(result: Any) -> Any:
-    err = getattr(result, "error", None)
+    try:
+        err = result.error
+    except AttributeError:
+        err = None
     if err:
         raise RuntimeError(_to_error_message(err))
-    return getattr(result, "data", None)
+    try:
+        return result.data
+    except AttributeError:
+        return None
 
 
 def _current_user(session: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    cached = st.session_state.get("_user_cached")
+    if cached is not None:
+        return cached
     if not session:
         return None
     user = session.get("user")
     if user and user.get("id"):
+        st.session_state["_user_cached"] = user
         return user
     return None
 
@@ -82,17 +148,17 @@ def _qp_get(name: str) -> Optional[str]:
     return str(v)
 
 
-def _jwt_payload(token: str) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=16)
+def _jwt_payload(token: str) -> Mapping[str, Any]:
     try:
         parts = (token or "").split(".")
         if len(parts) < 2:
-            return {}
+            return _EMPTY_MAPPING
         payload_b64 = parts[1]
-        payload_b64 += "=" * (-len(payload_b64) % 4)
-        raw = base64.urlsafe_b64decode(payload_b64.encode("utf-8"))
-        return json.loads(raw.decode("utf-8"))
+        raw = base64.b64decode(payload_b64.translate(_URLSAFE_B64_TRANS) + "=" * (-len(payload_b64) & 3))
+        return MappingProxyType(orjson.loads(raw))
     except Exception:
-        return {}
+        return _EMPTY_MAPPING
 
 
 def _session_from_tokens(access_token: str, refresh_token: str) -> Dict[str, Any]:
@@ -112,17 +178,39 @@ def _maybe_restore_session_from_query_params() -> None:
     at = _qp_get("at")
     rt = _qp_get("rt")
     if at and rt:
+        # 디코딩되지 않는 토큰은 set_session 왕복 없이 바로 버린다
+        if not _jwt_payload(at).get("sub"):
+            try:
+                st.query_params.clear()
+            except Exception:
+                pass
+            return
         st.session_state["sb_session"] = _session_from_tokens(at, rt)
         st.rerun()
 
 def _set_auth_query_params(access_token: str, refresh_token: str) -> None:
+    if st.session_state.get("_qp_at") == access_token and st.session_state.get("_qp_rt") == refresh_token:
+        return
     try:
         st.query_params["at"] = access_token
         st.query_params["rt"] = refresh_token
+        st.session_state["_qp_at"] = access_token
+        st.session_state["_qp_rt"] = refresh_token
     except Exception:
         pass
 
 
+def _commit_session(access_token: str, refresh_token: str, user_id: str, email: Optional[str]) -> None:
+    user = {"id": user_id, "email": email}
+    st.session_state["sb_session"] = {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "user": user,
+    }
+    st.session_state["_user_cached"] = user
+    _set_auth_query_params(access_token, refresh_token)
+
+
 def _sign_in(email: str, password: str) -> None:
     client = _create_client(None)
     res = client.auth.sign_in_with_password({"email": email, "password": password})
@@ -130,12 +218,7 @@ def _sign_in(email: str, password: str) -> None:
     user = getattr(res, "user", None)
     if not session or not user:
         raise RuntimeError("로그인에 실패했습니다.")
-    st.session_state["sb_session"] = {
-        "access_token": session.access_token,
-        "refresh_token": session.refresh_token,
-        "user": {"id": user.id, "email": user.email},
-    }
-    _set_auth_query_params(session.access_token, session.refresh_token)
+    _commit_session(session.access_token, session.refresh_token, user.id, user.email)
 
 
 def _sign_up(email: str, password: str) -> bool:
@@ -144,21 +227,24 @@ def _sign_up(email: str, password: str) -> bool:
     session = getattr(res, "session", None)
     user = getattr(res, "user", None)
     if session and user:
-        st.session_state["sb_session"] = {
-            "access_token": session.access_token,
-            "refresh_token": session.refresh_token,
-            "user": {"id": user.id, "email": user.email},
-        }
-        _set_auth_query_params(session.access_token, session.refresh_token)
+        _commit_session(session.access_token, session.refresh_token, user.id, user.email)
         return True
     return False
 
 
 def _logout() -> None:
     st.session_state.pop("sb_session", None)
+    st.session_state.pop("_user_cached", None)
     st.session_state.pop("selected_set_id", None)
     st.session_state.pop("selected_set_name", None)
     st.session_state.pop("selected_set_name_display", None)
+    st.session_state.pop("user_pref", None)
+    st.session_state.pop("_persisted_last_set_id", None)
+    st.session_state.pop("_persisted_tts_lang", None)
+    st.session_state.pop("_pref_dirty", None)
+    st.session_state.pop("pref_write_future", None)
+    st.session_state.pop("_qp_at", None)
+    st.session_state.pop("_qp_rt", None)
     try:
         st.query_params.clear()
     except Exception:
@@ -166,10 +252,53 @@ def _logout() -> None:
     st.rerun()
 
 
-@st.cache_data(show_spinner=False, ttl=30)
-def _load_sets(_client: Client) -> List[Dict[str, Any]]:
-    res = _client.table("word_sets").select("id,name,description,created_at").order("created_at", desc=True).execute()
-    return _execute(res) or []
+@st.cache_resource(show_spinner=False)
+def _data_cache() -> Dict[str, Dict[str, Tuple[float, List[Any]]]]:
+    # 목록은 프로세스 안에서 그대로 공유하고, 쓰기 함수가 해당 키를 직접 비운다
+    return {"sets": {}, "words": {}, "cards": {}}
+
+
+@st.cache_resource(show_spinner=False)
+def _data_cache_lock() -> threading.Lock:
+    return threading.Lock()
+
+
+def _cache_get(bucket: str, key: str, ttl: float) -> Optional[List[Any]]:
+    entries = _data_cache()[bucket]
+    with _data_cache_lock():
+        hit = entries.get(key)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] > ttl:
+            del entries[key]
+            return None
+    return hit[1]
+
+
+def _cache_put(bucket: str, key: str, value: List[Any]) -> List[Any]:
+    # 넣은 순서를 유지해 두고, 한도를 넘으면 가장 오래전에 넣은 항목부터 버린다
+    entries = _data_cache()[bucket]
+    with _data_cache_lock():
+        entries.pop(key, None)
+        entries[key] = (time.monotonic(), value)
+        while len(entries) > _DATA_CACHE_MAX_ENTRIES:
+            del entries[next(iter(entries))]
+    return value
+
+
+def _invalidate(bucket: str, key: str) -> None:
+    # 캐시는 모든 사용자가 같이 쓰므로 바뀐 키만 비운다 (카드 목록은 단어 목록에서 만들어지므로 함께)
+    with _data_cache_lock():
+        for name in ("words", "cards") if bucket == "words" else (bucket,):
+            _data_cache()[name].pop(key, None)
+
+
+def _load_sets(client: Client, user_id: str) -> List[Dict[str, Any]]:
+    cached = _cache_get("sets", user_id, _SETS_CACHE_TTL)
+    if cached is not None:
+        return cached
+    res = client.table("word_sets").select("id,name,description,created_at").order("created_at", desc=True).execute()
+    return _cache_put("sets", user_id, _execute(res) or [])
 
 
 def _create_set(client: Client, user_id: str, name: str, description: str) -> None:
@@ -178,34 +307,65 @@ def _create_set(client: Client, user_id: str, name: str, description: str) -> No
         payload["description"] = description.strip()
     res = client.table("word_sets").insert(payload).execute()
     _execute(res)
+    _invalidate("sets", user_id)
 
 
-def _delete_set(client: Client, set_id: str) -> None:
+def _delete_set(client: Client, user_id: str, set_id: str) -> None:
     res = client.table("word_sets").delete().eq("id", set_id).execute()
     _execute(res)
+    _invalidate("sets", user_id)
+    _invalidate("words", set_id)
 
 
 def _load_words(client: Client, set_id: str) -> List[Dict[str, Any]]:
-    res = (
-        client.table("words")
-        .select("id,word,meaning,pronunciation,example,created_at")
-        .eq("set_id", set_id)
-        .order("created_at", desc=True)
-        .execute()
-    )
-    return _execute(res) or []
+    cached = _cache_get("words", set_id, _WORDS_CACHE_TTL)
+    if cached is not None:
+        return cached
+    # PostgREST 의 max-rows 제한에 걸리지 않도록 페이지 단위로 나눠 가져온다
+    words: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        res = (
+            client.table("words")
+            .select("id,word,meaning,pronunciation,example,created_at")
+            .eq("set_id", set_id)
+            .order("created_at", desc=True)
+            .order("id")
+            .range(offset, offset + _WORDS_PAGE_SIZE - 1)
+            .execute()
+        )
+        page = _execute(res) or []
+        words.extend(page)
+        if len(page) < _WORDS_PAGE_SIZE:
+            return _cache_put("words", set_id, words)
+        offset += _WORDS_PAGE_SIZE
 
 
-@st.cache_data(show_spinner=False, ttl=30)
-def _load_words_oldest(_client: Client, set_id: str) -> List[Dict[str, Any]]:
-    res = (
-        _client.table("words")
-        .select("id,word,meaning,pronunciation,example,created_at")
-        .eq("set_id", set_id)
-        .order("created_at", desc=False)
-        .execute()
-    )
-    return _execute(res) or []
+def _load_words_oldest(client: Client, set_id: str) -> List[Dict[str, Any]]:
+    return list(reversed(_load_words(client, set_id=set_id)))
+
+
+def _refresh_words(set_id: str) -> None:
+    _invalidate("words", set_id)
+    st.session_state.pop("fc_words", None)
+    st.session_state.pop("fcr_words", None)
+
+
+def _word_label(w: Dict[str, Any]) -> str:
+    word = w.get("word")
+    meaning = w.get("meaning")
+    if word and meaning:
+        return f"{word} · {meaning}"
+    return word or meaning or "(빈 단어)"
+
+
+def _words_dataframe(words: List[Dict[str, Any]]) -> pd.DataFrame:
+    # 열 단위로 바로 만들어 행 dict 변환, fillna, rename 단계를 건너뛴다
+    columns = {
+        _WORD_TABLE_LABELS[col]: [w.get(col) or "" for w in words] for col in _WORD_TABLE_COLUMNS[:-1]
+    }
+    columns[_WORD_TABLE_LABELS["created_at"]] = [(w.get("created_at") or "")[:10] for w in words]
+    return pd.DataFrame(columns)
 
 
 def _create_word(
@@ -229,10 +389,14 @@ def _create_word(
         payload["example"] = example.strip()
     res = client.table("words").insert(payload).execute()
     _execute(res)
+    _invalidate("words", set_id)
+    _warm_tts(client, user_id, payload["word"])
 
 
 def _update_word(
     client: Client,
+    user_id: str,
+    set_id: str,
     word_id: str,
     word: str,
     meaning: str,
@@ -247,11 +411,14 @@ def _update_word(
     }
     res = client.table("words").update(payload).eq("id", word_id).execute()
     _execute(res)
+    _invalidate("words", set_id)
+    _warm_tts(client, user_id, payload["word"])
 
 
-def _delete_word(client: Client, word_id: str) -> None:
+def _delete_word(client: Client, set_id: str, word_id: str) -> None:
     res = client.table("words").delete().eq("id", word_id).execute()
     _execute(res)
+    _invalidate("words", set_id)
 
 
 def _load_user_pref(client: Client, user_id: str) -> Dict[str, Any]:
@@ -282,6 +449,74 @@ def _upsert_user_pref(
     _execute(res)
 
 
+@st.cache_resource(show_spinner=False)
+def _pref_write_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="pref-write")
+
+
+def _upsert_user_pref_after(
+    previous: Optional[Future],
+    client: Client,
+    user_id: str,
+    last_set_id: Optional[str],
+    tts_lang: Optional[str],
+) -> None:
+    # 같은 세션의 이전 저장이 끝난 뒤에 써야 오래된 값이 새 값을 덮지 않는다
+    if previous is not None:
+        wait([previous])
+    _upsert_user_pref(client, user_id, last_set_id, tts_lang)
+
+
+def _save_user_pref_async(
+    client: Client,
+    user_id: str,
+    last_set_id: Optional[str] = None,
+    tts_lang: Optional[str] = None,
+) -> None:
+    # 설정 저장은 화면에 보이는 결과가 없으므로 기다리지 않고, 결과는 다음 실행에서 확인한다
+    previous = st.session_state.get("pref_write_future")
+    st.session_state["pref_write_future"] = _pref_write_pool().submit(
+        _upsert_user_pref_after, previous, client, user_id, last_set_id, tts_lang
+    )
+
+
+def _check_pref_write() -> None:
+    future = st.session_state.get("pref_write_future")
+    if future is None or not future.done():
+        return
+    st.session_state.pop("pref_write_future", None)
+    if future.exception() is not None:
+        # 저장에 실패했으면 저장됨 표시를 되돌리고 다음 flush 에서 다시 쓴다
+        st.session_state.pop("_persisted_last_set_id", None)
+        st.session_state.pop("_persisted_tts_lang", None)
+        st.session_state["_pref_dirty"] = True
+
+
+def _load_bootstrap(client: Client, user_id: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    # 설정/세트 목록/첫 세트의 단어를 bootstrap() 한 번으로 받아 캐시에 채워 둔다
+    try:
+        boot = _execute(client.rpc("bootstrap", {}).execute())
+    except Exception:
+        boot = None
+    if isinstance(boot, dict):
+        sets = _cache_put("sets", user_id, boot.get("sets") or [])
+        words_set_id = boot.get("words_set_id")
+        if words_set_id:
+            _cache_put("words", words_set_id, boot.get("words") or [])
+        return boot.get("user_pref") or {}, sets
+    # bootstrap() 이 없는 DB 라면 user_prefs 조회를 백그라운드로 보내고 세트 목록과 동시에 가져온다
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pref_future = pool.submit(_load_user_pref, client, user_id)
+        try:
+            sets = _load_sets(client, user_id)
+        finally:
+            try:
+                user_pref: Optional[Dict[str, Any]] = pref_future.result()
+            except Exception:
+                user_pref = None
+    return user_pref, sets
+
+
 def _load_diaries(client: Client, user_id: str) -> List[Dict[str, Any]]:
     res = (
         client.table("diaries")
@@ -394,103 +629,424 @@ def _delete_memo(client: Client, memo_id: str) -> None:
     _execute(res)
 
 
-@st.cache_data(show_spinner=False)
-def _tts_mp3_bytes(text: str, lang: str) -> bytes:
+class WordCard(NamedTuple):
+    id: str
+    word: str
+    meaning: str
+    pronunciation: str
+    example: str
+    lang: str
+    word_html: str
+    meaning_html: str
+    pronunciation_html: str
+    example_html: str
+
+
+class TTSState(NamedTuple):
+    word_id: Optional[str]
+    lang: Optional[str]
+    audio: Optional[bytes]
+
+
+_NO_TTS = TTSState(None, None, None)
+
+
+def _to_word_cards(words: List[Dict[str, Any]]) -> List[WordCard]:
+    # 카드 화면에서 쓰는 값은 불러올 때 한 번만 정리해 둔다
+    cards: List[WordCard] = []
+    for w in words:
+        word = str(w.get("word") or "").strip()
+        meaning = str(w.get("meaning") or "").strip()
+        pronunciation = str(w.get("pronunciation") or "").strip()
+        example = str(w.get("example") or "").strip()
+        cards.append(
+            WordCard(
+                id=str(w.get("id") or ""),
+                word=word,
+                meaning=meaning,
+                pronunciation=pronunciation,
+                example=example,
+                lang=_guess_tts_lang(word),
+                word_html=html.escape(word, quote=False),
+                meaning_html=html.escape(meaning, quote=False),
+                pronunciation_html=html.escape(pronunciation, quote=False),
+                example_html=html.escape(example, quote=False),
+            )
+        )
+    return cards
+
+
+def _load_word_cards(client: Client, set_id: str) -> List[WordCard]:
+    # 두 플래시카드 탭(과 다른 세션)이 같은 카드 목록 하나를 같이 본다
+    cached = _cache_get("cards", set_id, _WORDS_CACHE_TTL)
+    if cached is not None:
+        return cached
+    return _cache_put("cards", set_id, _to_word_cards(_load_words_oldest(client, set_id=set_id)))
+
+
+def _tts_cache_key(text: str, lang: str) -> str:
+    return hashlib.sha256(f"{text}|{lang}".encode("utf-8")).hexdigest()
+
+
+def _synthesize_mp3(text: str, lang: str) -> bytes:
     fp = BytesIO()
     gTTS(text=text, lang=lang).write_to_fp(fp)
     return fp.getvalue()
 
 
+def _read_tts_disk(key: str) -> Optional[bytes]:
+    path = _TTS_DISK_DIR / f"{key}.mp3"
+    try:
+        if time.time() - path.stat().st_mtime > _TTS_DISK_TTL:
+            return None
+        audio = path.read_bytes()
+        # 읽을 때 mtime 을 갱신해 두면 정리할 때 오래 안 쓴 파일부터 지워진다
+        os.utime(path)
+        return audio
+    except OSError:
+        return None
+
+
+def _prune_tts_disk() -> None:
+    # 만료된 파일과 쓰다 남은 임시 파일을 지우고, 그래도 많으면 오래 안 쓴 순으로 한도의 90% 까지 줄인다
+    now = time.time()
+    for path in _TTS_DISK_DIR.glob("*.tmp"):
+        try:
+            if now - path.stat().st_mtime > _TTS_DISK_TMP_TTL:
+                path.unlink()
+        except OSError:
+            pass
+    entries = []
+    for path in _TTS_DISK_DIR.glob("*.mp3"):
+        try:
+            mtime = path.stat().st_mtime
+            if now - mtime > _TTS_DISK_TTL:
+                path.unlink()
+            else:
+                entries.append((mtime, path))
+        except OSError:
+            pass
+    if len(entries) <= _TTS_DISK_MAX_FILES:
+        return
+    entries.sort()
+    for _, path in entries[: len(entries) - _TTS_DISK_MAX_FILES * 9 // 10]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _maybe_prune_tts_disk() -> None:
+    # 정리 시각은 표시 파일의 mtime 으로 기록해 재실행/프로세스가 달라도 주기당 한 번만 돌게 하고,
+    # 디렉터리 전체를 훑는 일은 기다리는 카드와 상관없는 별도 스레드에서 한다
+    marker = _TTS_DISK_DIR / ".pruned"
+    try:
+        if time.time() - marker.stat().st_mtime < _TTS_DISK_PRUNE_INTERVAL:
+            return
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return
+    try:
+        marker.touch()
+    except OSError:
+        return
+    threading.Thread(target=_prune_tts_disk, name="tts-disk-prune", daemon=True).start()
+
+
+def _write_tts_disk(key: str, audio: bytes) -> None:
+    tmp_name = None
+    try:
+        _TTS_DISK_DIR.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=_TTS_DISK_DIR, suffix=".tmp", delete=False) as fp:
+            tmp_name = fp.name
+            fp.write(audio)
+        os.replace(tmp_name, _TTS_DISK_DIR / f"{key}.mp3")
+    except OSError:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+        return
+    _maybe_prune_tts_disk()
+
+
+def _load_tts_mp3(client: Client, user_id: str, text: str, lang: str) -> bytes:
+    # 같은 (단어, 언어) 음성은 로컬 디스크 → 내 Storage 폴더 순으로 찾고, 없을 때만 새로 만든다
+    key = _tts_cache_key(text, lang)
+    audio = _read_tts_disk(key)
+    if audio is not None:
+        return audio
+    bucket = client.storage.from_(_TTS_BUCKET)
+    # Storage 객체는 사용자가 직접 올릴 수 있으므로 본인 폴더만 쓰고, 공유되는 디스크 캐시에는 넣지 않는다
+    path = f"{user_id}/{key}.mp3"
+    try:
+        return bucket.download(path)
+    except Exception:
+        pass
+    audio = _synthesize_mp3(text, lang)
+    _write_tts_disk(key, audio)
+    try:
+        bucket.upload(path, audio, {"content-type": "audio/mpeg", "cache-control": _TTS_CACHE_CONTROL})
+    except Exception:
+        pass
+    return audio
+
+
+@st.cache_resource(show_spinner=False, max_entries=512)
+def _tts_mp3_bytes(_client: Client, user_id: str, text: str, lang: str) -> bytes:
+    return _load_tts_mp3(_client, user_id, text, lang)
+
+
+@st.cache_resource(show_spinner=False)
+def _tts_prefetch_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts-prefetch")
+
+
+def _warm_tts(client: Client, user_id: str, text: str) -> None:
+    # 저장 직후 음성을 미리 만들어 Storage 에 올려 두면 첫 재생부터 gTTS 를 기다리지 않는다
+    if text:
+        _tts_prefetch_pool().submit(_load_tts_mp3, client, user_id, text, _guess_tts_lang(text))
+
+
+def _prefetch_tts(client: Client, user_id: str, prefix: str, cards: List[WordCard], indices: List[int]) -> None:
+    # 이웃 카드 음성을 백그라운드에서 미리 만들어 두고, 필요 없어진 예약은 버린다
+    state_key = f"{prefix}_tts_prefetch"
+    previous = st.session_state.get(state_key) or {}
+    futures = {}
+    for i in indices:
+        card = cards[i]
+        if not card.word:
+            continue
+        key = (card.id or str(i), card.lang)
+        futures[key] = previous.get(key) or _tts_prefetch_pool().submit(
+            _load_tts_mp3, client, user_id, card.word, card.lang
+        )
+    for key, future in previous.items():
+        if key not in futures:
+            future.cancel()
+    st.session_state[state_key] = futures
+
+
+def _drop_prefetched_tts(prefix: str) -> None:
+    # 아직 시작하지 않은 예약은 취소해서 공유 작업자 큐에 쌓이지 않게 한다
+    for future in (st.session_state.pop(f"{prefix}_tts_prefetch", None) or {}).values():
+        future.cancel()
+
+
+def _take_prefetched_tts(prefix: str, word_id: str, lang: str) -> Optional[bytes]:
+    future = (st.session_state.get(f"{prefix}_tts_prefetch") or {}).pop((word_id, lang), None)
+    # 아직 큐에서 기다리는 작업이면 취소하고 바로 만든다 (다른 세션 작업 뒤에 줄 서지 않도록)
+    if future is None or future.cancel():
+        return None
+    if not (future.done() or future.running()):
+        return None
+    try:
+        return future.result()
+    except Exception:
+        return None
+
+
+def _fcr_rng() -> random.Random:
+    # 카드 순서는 보안과 무관하므로 세션마다 한 번 시드한 PRNG 를 쓴다
+    rng = st.session_state.get("fcr_rng")
+    if rng is None:
+        rng = random.Random()
+        st.session_state["fcr_rng"] = rng
+    return rng
+
+
+def _random_next_index(n: int, current: int) -> int:
+    if n <= 1:
+        return 0
+    r = _fcr_rng().randrange(n - 1)
+    return r + 1 if r >= current else r
+
+
+@functools.lru_cache(maxsize=8192)
 def _guess_tts_lang(text: str) -> str:
-    s = (text or "").strip()
-    if not s:
-        return "en"
-    for ch in s:
-        code = ord(ch)
-        if 0xAC00 <= code <= 0xD7A3:
-            return "ko"
-        if (0x3040 <= code <= 0x309F) or (0x30A0 <= code <= 0x30FF):
-            return "ja"
-        if 0x4E00 <= code <= 0x9FFF:
-            return "zh-CN"
+    m = _TTS_LANG_RE.search(text or "")
+    if m:
+        return _TTS_LANG_BY_GROUP[m.lastindex]
     return "en"
 
 
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    return pathlib.Path(__file__).parent.joinpath("style.css").read_text(encoding="utf-8")
+
+
 def _apply_mobile_css() -> None:
-    st.markdown(
-        """
-        <style>
-          .block-container { padding-top: calc(1.5rem + env(safe-area-inset-top)); padding-bottom: 6.5rem; }
-          div[data-testid="stForm"] { border: 1px solid rgba(49, 51, 63, 0.2); padding: 0.75rem; border-radius: 0.75rem; }
-          div[data-testid="stTextInput"] input, div[data-testid="stTextArea"] textarea, div[data-testid="stSelectbox"] div { font-size: 16px; }
-          div[data-testid="stAudio"] { width: 100%; }
-          .wp-header-marker + div[data-testid="stHorizontalBlock"] {
-            align-items: center !important;
-            margin-top: 0.25rem !important;
-            margin-bottom: 0.5rem !important;
-          }
-          .wp-header-text {
-            font-size: 16px;
-            font-weight: 600;
-            opacity: 0.98;
-          }
-          .wp-header-marker + div[data-testid="stHorizontalBlock"] .stButton > button {
-            font-weight: 700;
-            white-space: nowrap !important;
-          }
-          .fc-controls-marker + div[data-testid="stHorizontalBlock"],
-          .fcr-controls-marker + div[data-testid="stHorizontalBlock"] {
-            display: flex !important;
-            flex-direction: row !important;
-            flex-wrap: nowrap !important;
-            align-items: stretch !important;
-            gap: 4px !important;
-            width: 100% !important;
-            margin: 0 !important;
-            position: fixed !important;
-            left: 50% !important;
-            transform: translateX(-50%) !important;
-            bottom: 0 !important;
-            z-index: 1000 !important;
-            max-width: 700px !important;
-            width: min(700px, calc(100% - 1.5rem)) !important;
-            padding: 0.5rem 0.5rem 0.75rem 0.5rem !important;
-            background: rgba(17, 17, 17, 0.88) !important;
-            border-top: 1px solid rgba(255, 255, 255, 0.12) !important;
-            border-left: 1px solid rgba(255, 255, 255, 0.12) !important;
-            border-right: 1px solid rgba(255, 255, 255, 0.12) !important;
-            border-top-left-radius: 0.75rem !important;
-            border-top-right-radius: 0.75rem !important;
-          }
-          .fc-controls-marker + div[data-testid="stHorizontalBlock"] > div[data-testid="column"],
-          .fcr-controls-marker + div[data-testid="stHorizontalBlock"] > div[data-testid="column"] {
-            min-width: 0 !important;
-            flex: 1 1 0 !important;
-            width: 33.333% !important;
-            max-width: 33.333% !important;
-          }
-          .fc-controls-marker + div[data-testid="stHorizontalBlock"] .stButton > button,
-          .fcr-controls-marker + div[data-testid="stHorizontalBlock"] .stButton > button {
-            width: 100% !important;
-            white-space: nowrap !important;
-            padding: clamp(6px, 1.4vw, 9px) clamp(4px, 1.2vw, 7px);
-            font-size: clamp(12px, 3.2vw, 16px);
-            line-height: 1.1;
-          }
-          @media (max-width: 640px) {
-            .block-container { padding-left: 0.75rem; padding-right: 0.75rem; }
-            .wp-header-text { font-size: 14px; }
-            .fc-controls-marker + div[data-testid="stHorizontalBlock"] .stButton > button,
-            .fcr-controls-marker + div[data-testid="stHorizontalBlock"] .stButton > button {
-              padding: 0.45rem 0.25rem;
-              font-size: 12px;
-            }
-          }
-        </style>
-        """,
+    st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
+
+
+def _fc_current_index(words: List[WordCard]) -> int:
+    fc_index = min(max(int(st.session_state.get("fc_index", 0) or 0), 0), len(words) - 1)
+    st.session_state["fc_index"] = fc_index
+    return fc_index
+
+
+def _fc_neighbors(words: List[WordCard], index: int) -> List[int]:
+    return [i for i in (index + 1, index - 1) if 0 <= i < len(words)]
+
+
+def _fc_go_prev(words: List[WordCard], index: int) -> None:
+    st.session_state["fc_index"] = max(0, index - 1)
+
+
+def _fc_go_next(words: List[WordCard], index: int) -> None:
+    st.session_state["fc_index"] = min(len(words) - 1, index + 1)
+
+
+def _fcr_current_index(words: List[WordCard]) -> int:
+    history = st.session_state.get("fcr_history")
+    if not isinstance(history, array) or not history:
+        start_index = _fcr_rng().randrange(len(words))
+        history = array("I", [start_index])
+        st.session_state["fcr_history"] = history
+        st.session_state["fcr_pos"] = 0
+        st.session_state.pop("fcr_next_index", None)
+
+    fcr_pos = min(max(int(st.session_state.get("fcr_pos", 0) or 0), 0), len(history) - 1)
+    st.session_state["fcr_pos"] = fcr_pos
+
+    fcr_index = min(max(int(history[fcr_pos] or 0), 0), len(words) - 1)
+    history[fcr_pos] = fcr_index
+    st.session_state["fcr_index"] = fcr_index
+    return fcr_index
+
+
+def _fcr_neighbors(words: List[WordCard], index: int) -> List[int]:
+    history = st.session_state["fcr_history"]
+    fcr_pos = st.session_state["fcr_pos"]
+    # 다음 랜덤 카드를 미리 뽑아 두어야 그 음성도 미리 준비할 수 있다
+    if fcr_pos < len(history) - 1:
+        next_index = history[fcr_pos + 1]
+    else:
+        next_index = st.session_state.get("fcr_next_index")
+        if next_index is None or next_index >= len(words):
+            next_index = _random_next_index(len(words), index)
+            st.session_state["fcr_next_index"] = next_index
+    neighbor_indices = [next_index]
+    if fcr_pos > 0:
+        neighbor_indices.append(history[fcr_pos - 1])
+    return [i for i in neighbor_indices if 0 <= i < len(words)]
+
+
+def _fcr_go_prev(words: List[WordCard], index: int) -> None:
+    fcr_pos = int(st.session_state.get("fcr_pos", 0) or 0)
+    if fcr_pos > 0:
+        st.session_state["fcr_pos"] = fcr_pos - 1
+
+
+def _fcr_go_next(words: List[WordCard], index: int) -> None:
+    history = st.session_state["fcr_history"]
+    fcr_pos = int(st.session_state.get("fcr_pos", 0) or 0)
+    if fcr_pos < len(history) - 1:
+        st.session_state["fcr_pos"] = fcr_pos + 1
+    else:
+        next_index = st.session_state.pop("fcr_next_index", None)
+        if next_index is None or next_index >= len(words):
+            next_index = _random_next_index(len(words), index)
+        history.append(next_index)
+        if len(history) > _FCR_HISTORY_MAX:
+            del history[0]
+        st.session_state["fcr_pos"] = len(history) - 1
+
+
+_CARD_NAVIGATORS = {
+    "fc": (_fc_current_index, _fc_neighbors, _fc_go_prev, _fc_go_next),
+    "fcr": (_fcr_current_index, _fcr_neighbors, _fcr_go_prev, _fcr_go_next),
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _card_html(card: WordCard, revealed: bool) -> str:
+    # 단어와 (정답을 본 경우) 뜻/발음/예문을 하나의 마크다운으로 보낸다
+    header = _CARD_HEADER_TMPL.format_map({"word": card.word_html or "(빈 단어)"})
+    if not revealed:
+        return header
+    return header + _CARD_BODY_TMPL.format_map(
+        {
+            "meaning": card.meaning_html,
+            "pronunciation": card.pronunciation_html,
+            "example": card.example_html,
+        }
+    )
+
+
+def _on_card_move(prefix: str, move: Any, words: List[WordCard], index: int) -> None:
+    # 버튼 콜백은 fragment 재실행 전에 돌기 때문에 별도 st.rerun 이 필요 없다
+    move(words, index)
+    st.session_state[f"{prefix}_revealed"] = False
+    st.session_state.pop(f"{prefix}_tts", None)
+    # 숨은 탭도 함께 그려지므로 자동 재생은 이 탭에서 카드를 넘긴 직후에만 한다
+    st.session_state[f"{prefix}_autoplay"] = True
+
+
+@st.fragment
+def _render_card(client: Client, user_id: str, prefix: str, words: List[WordCard]) -> None:
+    # 카드 이동/정답 클릭은 이 fragment 만 다시 실행한다
+    if not words:
+        # st.stop() 을 쓰면 뒤쪽 탭(일기/캘린더/메모)까지 그려지지 않으므로 여기서만 끝낸다
+        st.info("이 세트에는 아직 단어가 없습니다.")
+        return
+    current_index, neighbors, go_prev, go_next = _CARD_NAVIGATORS[prefix]
+    index = current_index(words)
+
+    current = words[index]
+    word_text = current.word
+
+    card_slot = st.empty()
+    card_slot.markdown(
+        _card_html(current, bool(st.session_state.get(f"{prefix}_revealed", False))),
         unsafe_allow_html=True,
     )
 
+    tts_lang = current.lang
+    current_word_id = current.id or str(index)
+
+    autoplay = bool(st.session_state.pop(f"{prefix}_autoplay", False))
+    if word_text:
+        tts = st.session_state.get(f"{prefix}_tts") or _NO_TTS
+        if not (tts.audio and tts[:2] == (current_word_id, tts_lang)):
+            try:
+                with st.spinner("음성 준비 중..."):
+                    audio_bytes = _take_prefetched_tts(prefix, current_word_id, tts_lang) or _tts_mp3_bytes(
+                        client, user_id, text=word_text, lang=tts_lang
+                    )
+                tts = TTSState(current_word_id, tts_lang, audio_bytes)
+                st.session_state[f"{prefix}_tts"] = tts
+            except Exception:
+                tts = _NO_TTS
+        if tts.audio:
+            st.audio(tts.audio, format="audio/mp3", autoplay=autoplay)
+    _prefetch_tts(client, user_id, prefix, words, neighbors(words, index))
+
+    st.markdown(f'<div class="{prefix}-controls-marker"></div>', unsafe_allow_html=True)
+    col_prev, col_answer, col_next = st.columns(3)
+    with col_prev:
+        st.button(
+            "이전",
+            key=f"{prefix}_prev",
+            use_container_width=True,
+            on_click=_on_card_move,
+            args=(prefix, go_prev, words, index),
+        )
+    with col_answer:
+        if st.button("정답", key=f"{prefix}_answer", use_container_width=True):
+            st.session_state[f"{prefix}_revealed"] = True
+            card_slot.markdown(_card_html(current, True), unsafe_allow_html=True)
+    with col_next:
+        st.button(
+            "다음",
+            key=f"{prefix}_next",
+            use_container_width=True,
+            on_click=_on_card_move,
+            args=(prefix, go_next, words, index),
+        )
+
 
 st.set_page_config(page_title="Life Writer", page_icon="📚", layout="centered")
 _apply_mobile_css()
@@ -535,41 +1091,37 @@ if not user:
 
 client = _create_client(session)
 
+user_pref = st.session_state.get("user_pref")
 try:
-    user_pref = st.session_state.get("user_pref")
     if user_pref is None:
-        user_pref = _load_user_pref(client, user["id"])
-        st.session_state["user_pref"] = user_pref
-except Exception:
-    user_pref = st.session_state.get("user_pref") or {}
-
-try:
-    sets = _load_sets(client)
+        loaded_pref, sets = _load_bootstrap(client, user["id"])
+        if loaded_pref is not None:
+            st.session_state["user_pref"] = loaded_pref
+        user_pref = {} if loaded_pref is None else loaded_pref
+    else:
+        sets = _load_sets(client, user["id"])
 except Exception as e:
     st.error(_to_error_message(e))
+    user_pref = st.session_state.get("user_pref") or {}
     sets = []
 
 set_options = {s["name"]: s["id"] for s in sets if s.get("id") and s.get("name")}
 set_names = list(set_options.keys())
+id_to_name = {sid: name for name, sid in set_options.items()}
 
 selected_set_id = st.session_state.get("selected_set_id")
 selected_set_name_display = st.session_state.get("selected_set_name_display") or st.session_state.get("selected_set_name")
-pref_set_id = None
-if isinstance(user_pref, dict):
-    pref_set_id = user_pref.get("last_set_id")
+pref_set_id = user_pref.get("last_set_id")
 if selected_set_name_display and selected_set_name_display in set_options:
     selected_set_id = set_options[selected_set_name_display]
     st.session_state["selected_set_id"] = selected_set_id
-elif not selected_set_id and pref_set_id and pref_set_id in set_options.values():
+elif not selected_set_id and pref_set_id and pref_set_id in id_to_name:
     selected_set_id = pref_set_id
     st.session_state["selected_set_id"] = pref_set_id
 
-if selected_set_id and not selected_set_name_display:
-    for name, sid in set_options.items():
-        if sid == selected_set_id:
-            selected_set_name_display = name
-            st.session_state["selected_set_name_display"] = name
-            break
+if selected_set_id and not selected_set_name_display and selected_set_id in id_to_name:
+    selected_set_name_display = id_to_name[selected_set_id]
+    st.session_state["selected_set_name_display"] = selected_set_name_display
 
 current_set_name = selected_set_name_display or "(미선택)"
 st.markdown('<div class="wp-header-marker"></div>', unsafe_allow_html=True)
@@ -612,27 +1164,13 @@ with sets_list_tab:
 
     selected_set_id = st.session_state.get("selected_set_id")
     selected_set_name_display = st.session_state.get("selected_set_name_display")
-    try:
-        user_pref = st.session_state.get("user_pref")
-        if user_pref is None:
-            user_pref = _load_user_pref(client, user["id"])
-            st.session_state["user_pref"] = user_pref
-    except Exception:
-        user_pref = st.session_state.get("user_pref") or {}
 
-    pref_set_id = None
-    if isinstance(user_pref, dict):
-        pref_set_id = user_pref.get("last_set_id")
-
-    if not selected_set_id and pref_set_id and pref_set_id in set_options.values():
+    if not selected_set_id and pref_set_id and pref_set_id in id_to_name:
         selected_set_id = pref_set_id
         st.session_state["selected_set_id"] = pref_set_id
 
-    if selected_set_id:
-        for name, sid in set_options.items():
-            if sid == selected_set_id:
-                selected_set_name_display = name
-                break
+    if selected_set_id in id_to_name:
+        selected_set_name_display = id_to_name[selected_set_id]
 
     if set_names:
         index = 0
@@ -642,18 +1180,11 @@ with sets_list_tab:
         selected_set_id_new = set_options.get(selected_set_name)
         st.session_state["selected_set_id"] = selected_set_id_new
         st.session_state["selected_set_name_display"] = selected_set_name
-        try:
-            _upsert_user_pref(
-                client,
-                user_id=user["id"],
-                last_set_id=selected_set_id_new,
-                tts_lang=(user_pref.get("tts_lang") if isinstance(user_pref, dict) else None),
-            )
-            if isinstance(user_pref, dict):
-                user_pref["last_set_id"] = selected_set_id_new
-                st.session_state["user_pref"] = user_pref
-        except Exception:
-            pass
+        if selected_set_id_new != st.session_state.get("_persisted_last_set_id", pref_set_id):
+            st.session_state["_persisted_last_set_id"] = selected_set_id_new
+            user_pref["last_set_id"] = selected_set_id_new
+            st.session_state["user_pref"] = user_pref
+            st.session_state["_pref_dirty"] = True
     else:
         st.info("아직 세트가 없습니다. '세트 추가' 탭에서 새 세트를 추가하세요.")
         st.session_state.pop("selected_set_id", None)
@@ -667,7 +1198,7 @@ with sets_list_tab:
             confirm = st.checkbox("삭제를 이해했고 진행할게요", value=False)
             if st.button("선택한 세트 삭제", disabled=not confirm, use_container_width=True):
                 try:
-                    _delete_set(client, set_id=selected_set_id)
+                    _delete_set(client, user_id=user["id"], set_id=selected_set_id)
                     st.session_state.pop("selected_set_id", None)
                     st.success("세트를 삭제했습니다.")
                     st.rerun()
@@ -737,20 +1268,34 @@ with words_tab:
     if not words:
         st.info("아직 단어가 없습니다.")
     else:
+        # 표만 캐시된 전체 단어에서 한 페이지씩 그리고, 아래 선택 상자들은 전체 단어를 그대로 쓴다
+        page_count = -(-len(words) // _WORDS_TABLE_PAGE_SIZE)
+        page = 1
+        if page_count > 1:
+            page = int(
+                st.number_input(
+                    f"페이지 (1-{page_count})",
+                    min_value=1,
+                    max_value=page_count,
+                    value=1,
+                    step=1,
+                    key=f"words_page_{selected_set_id}",
+                )
+            )
+        page_start = (page - 1) * _WORDS_TABLE_PAGE_SIZE
+        page_words = words[page_start : page_start + _WORDS_TABLE_PAGE_SIZE]
         st.dataframe(
-            [
-                {
-                    "단어": (w.get("word") or ""),
-                    "의미": (w.get("meaning") or ""),
-                    "발음": (w.get("pronunciation") or ""),
-                    "예문": (w.get("example") or ""),
-                    "추가일": (w.get("created_at") or "")[:10],
-                }
-                for w in words
-            ],
+            _words_dataframe(page_words),
             use_container_width=True,
             hide_index=True,
         )
+        if page_count > 1:
+            st.caption(f"전체 {len(words)}개 중 {page_start + 1}-{page_start + len(page_words)}번째")
+
+        options = [(w["id"], _word_label(w)) for w in words if w.get("id")]
+        option_ids = [wid for wid, _ in options]
+        label_by_id = dict(options)
+        word_by_id = {w["id"]: w for w in words if w.get("id")}
 
         with st.expander("발음 듣기", expanded=False):
             lang_options = {
@@ -759,10 +1304,7 @@ with words_tab:
                 "일본어(ja)": "ja",
                 "중국어(zh-CN)": "zh-CN",
             }
-            user_pref = st.session_state.get("user_pref")
-            saved_tts = None
-            if isinstance(user_pref, dict):
-                saved_tts = user_pref.get("tts_lang")
+            saved_tts = user_pref.get("tts_lang")
             labels = list(lang_options.keys())
             default_index = 0
             if saved_tts:
@@ -778,35 +1320,18 @@ with words_tab:
             )
             tts_lang = lang_options[tts_lang_label]
 
-            if tts_lang != saved_tts:
-                try:
-                    _upsert_user_pref(
-                        client,
-                        user_id=user["id"],
-                        last_set_id=st.session_state.get("selected_set_id"),
-                        tts_lang=tts_lang,
-                    )
-                    if not isinstance(user_pref, dict):
-                        user_pref = {}
-                    user_pref["tts_lang"] = tts_lang
-                    st.session_state["user_pref"] = user_pref
-                except Exception:
-                    pass
-
-            options = [
-                (w["id"], f"{(w.get('word') or '')} · {(w.get('meaning') or '')}".strip(" ·"))
-                for w in words
-                if w.get("id")
-            ]
-            if not options:
+            if tts_lang != st.session_state.get("_persisted_tts_lang", saved_tts):
+                st.session_state["_persisted_tts_lang"] = tts_lang
+                user_pref["tts_lang"] = tts_lang
+                st.session_state["user_pref"] = user_pref
+                st.session_state["_pref_dirty"] = True
+
+            if not option_ids:
                 st.info("재생 가능한 단어가 없습니다.")
             else:
-                label_by_id = {wid: label for wid, label in options}
-                word_by_id = {w["id"]: w for w in words if w.get("id")}
-
                 selected_tts_word_id = st.selectbox(
                     "재생할 단어 선택",
-                    options=[wid for wid, _ in options],
+                    options=option_ids,
                     format_func=lambda wid: label_by_id.get(wid, wid),
                     key="tts_selected_word_id",
                 )
@@ -819,7 +1344,7 @@ with words_tab:
                     else:
                         try:
                             with st.spinner("발음을 생성 중..."):
-                                audio_bytes = _tts_mp3_bytes(text=speak_text, lang=tts_lang)
+                                audio_bytes = _tts_mp3_bytes(client, user["id"], text=speak_text, lang=tts_lang)
                             st.session_state["tts_word_id"] = selected_tts_word_id
                             st.session_state["tts_audio"] = audio_bytes
                             st.session_state["tts_audio_lang"] = tts_lang
@@ -839,20 +1364,12 @@ with words_tab:
                     st.audio(active_tts_audio, format="audio/mp3")
 
         with st.expander("단어 수정", expanded=False):
-            options = [
-                (w["id"], f"{(w.get('word') or '')} · {(w.get('meaning') or '')}".strip(" ·"))
-                for w in words
-                if w.get("id")
-            ]
-            if not options:
+            if not option_ids:
                 st.info("수정 가능한 단어가 없습니다.")
             else:
-                label_by_id = {wid: label for wid, label in options}
-                word_by_id = {w["id"]: w for w in words if w.get("id")}
-
                 selected_edit_word_id = st.selectbox(
                     "수정할 단어 선택",
-                    options=[wid for wid, _ in options],
+                    options=option_ids,
                     format_func=lambda wid: label_by_id.get(wid, wid),
                     key="edit_word_id",
                 )
@@ -888,6 +1405,8 @@ with words_tab:
                         try:
                             _update_word(
                                 client,
+                                user_id=user["id"],
+                                set_id=selected_set_id,
                                 word_id=selected_edit_word_id,
                                 word=new_word,
                                 meaning=new_meaning,
@@ -900,22 +1419,16 @@ with words_tab:
                             st.error(_to_error_message(e))
 
         with st.expander("단어 삭제", expanded=False):
-            options = [
-                (w["id"], f"{(w.get('word') or '')} · {(w.get('meaning') or '')}".strip(" ·"))
-                for w in words
-                if w.get("id")
-            ]
-            if options:
-                label_by_id = {wid: label for wid, label in options}
+            if option_ids:
                 selected_word_id = st.selectbox(
                     "삭제할 단어 선택",
-                    options=[wid for wid, _ in options],
+                    options=option_ids,
                     format_func=lambda wid: label_by_id.get(wid, wid),
                 )
                 confirm = st.checkbox("삭제를 이해했고 진행할게요", value=False, key="confirm_delete_word")
                 if st.button("선택한 단어 삭제", disabled=not confirm, use_container_width=True):
                     try:
-                        _delete_word(client, word_id=selected_word_id)
+                        _delete_word(client, set_id=selected_set_id, word_id=selected_word_id)
                         st.success("단어를 삭제했습니다.")
                         st.rerun()
                     except Exception as e:
@@ -923,6 +1436,17 @@ with words_tab:
             else:
                 st.info("삭제 가능한 단어가 없습니다.")
 
+# 세트/발음 언어 변경은 플래그만 남겨 두었다가 여기서 한 번에 저장한다
+# (플래그가 session_state 에 있으므로 중간에 rerun/stop 되어도 다음 실행에서 저장된다)
+_check_pref_write()
+if st.session_state.pop("_pref_dirty", False):
+    _save_user_pref_async(
+        client,
+        user_id=user["id"],
+        last_set_id=user_pref.get("last_set_id"),
+        tts_lang=user_pref.get("tts_lang"),
+    )
+
 with flash_tab:
     st.subheader("플래시카드")
     selected_set_id = st.session_state.get("selected_set_id")
@@ -930,116 +1454,29 @@ with flash_tab:
         st.info("먼저 '세트 목록'에서 세트를 선택하세요.")
         st.stop()
 
+    if st.button("새로고침", key="fc_refresh"):
+        _refresh_words(selected_set_id)
+
     if st.session_state.get("fc_set_id") != selected_set_id:
         st.session_state["fc_set_id"] = selected_set_id
         st.session_state["fc_index"] = 0
         st.session_state["fc_revealed"] = False
-        st.session_state.pop("fc_tts_word_id", None)
-        st.session_state.pop("fc_tts_lang", None)
-        st.session_state.pop("fc_tts_audio", None)
+        _drop_prefetched_tts("fc")
+        st.session_state.pop("fc_tts", None)
         try:
-            st.session_state["fc_words"] = _load_words_oldest(client, set_id=selected_set_id)
+            st.session_state["fc_words"] = _load_word_cards(client, set_id=selected_set_id)
         except Exception as e:
             st.error(_to_error_message(e))
             st.session_state["fc_words"] = []
     elif "fc_words" not in st.session_state:
         try:
-            st.session_state["fc_words"] = _load_words_oldest(client, set_id=selected_set_id)
+            st.session_state["fc_words"] = _load_word_cards(client, set_id=selected_set_id)
         except Exception as e:
             st.error(_to_error_message(e))
             st.session_state["fc_words"] = []
     words_fc = st.session_state.get("fc_words", [])
 
-    if not words_fc:
-        st.info("이 세트에는 아직 단어가 없습니다.")
-        st.stop()
-
-    fc_index = int(st.session_state.get("fc_index", 0) or 0)
-    if fc_index < 0:
-        fc_index = 0
-    if fc_index >= len(words_fc):
-        fc_index = len(words_fc) - 1
-    st.session_state["fc_index"] = fc_index
-
-    current = words_fc[fc_index]
-    word_text = (current.get("word") or "").strip()
-    meaning_text = str(current.get("meaning") or "").strip()
-    pronunciation_text = str(current.get("pronunciation") or "").strip()
-    example_text = str(current.get("example") or "").strip()
-
-    st.markdown(
-        f"""
-        <div style="font-size:54px;font-weight:700;text-align:center;padding:2.5rem 0;">
-          {(word_text if word_text else "(빈 단어)")}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    user_pref = st.session_state.get("user_pref") or {}
-    saved_tts_lang = None
-    if isinstance(user_pref, dict) and user_pref.get("tts_lang"):
-        saved_tts_lang = str(user_pref.get("tts_lang"))
-    tts_lang = _guess_tts_lang(word_text) or (saved_tts_lang or "en")
-    current_word_id = str(current.get("id") or fc_index)
-
-    active_tts_word_id = st.session_state.get("fc_tts_word_id")
-    active_tts_audio = st.session_state.get("fc_tts_audio")
-    active_tts_lang = st.session_state.get("fc_tts_lang")
-    need_audio = bool(word_text) and not (
-        active_tts_audio and active_tts_word_id == current_word_id and active_tts_lang == tts_lang
-    )
-    if need_audio:
-        try:
-            with st.spinner("음성 준비 중..."):
-                audio_bytes = _tts_mp3_bytes(text=word_text, lang=tts_lang)
-            st.session_state["fc_tts_word_id"] = current_word_id
-            st.session_state["fc_tts_lang"] = tts_lang
-            st.session_state["fc_tts_audio"] = audio_bytes
-            active_tts_word_id = current_word_id
-            active_tts_lang = tts_lang
-            active_tts_audio = audio_bytes
-        except Exception:
-            active_tts_audio = None
-
-    if active_tts_audio and active_tts_word_id == current_word_id and active_tts_lang == tts_lang:
-        st.audio(active_tts_audio, format="audio/mp3")
-
-    show_answer = bool(st.session_state.get("fc_revealed", False))
-    if show_answer:
-        st.markdown(
-            f"""
-            <div style="text-align:center;padding:1rem 0;">
-              <div style="font-size:34px;font-weight:700;margin-bottom:0.75rem;">{(meaning_text or "")}</div>
-              <div style="font-size:28px;margin-bottom:0.5rem;">{(pronunciation_text or "")}</div>
-              <div style="font-size:24px;line-height:1.6;">{(example_text or "")}</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    st.markdown('<div class="fc-controls-marker"></div>', unsafe_allow_html=True)
-    col_prev, col_answer, col_next = st.columns(3)
-    with col_prev:
-        if st.button("이전", key="fc_prev", use_container_width=True):
-            st.session_state["fc_index"] = max(0, fc_index - 1)
-            st.session_state["fc_revealed"] = False
-            st.session_state.pop("fc_tts_word_id", None)
-            st.session_state.pop("fc_tts_lang", None)
-            st.session_state.pop("fc_tts_audio", None)
-            st.rerun()
-    with col_answer:
-        if st.button("정답", key="fc_answer", use_container_width=True):
-            st.session_state["fc_revealed"] = True
-            st.rerun()
-    with col_next:
-        if st.button("다음", key="fc_next", use_container_width=True):
-            st.session_state["fc_index"] = min(len(words_fc) - 1, fc_index + 1)
-            st.session_state["fc_revealed"] = False
-            st.session_state.pop("fc_tts_word_id", None)
-            st.session_state.pop("fc_tts_lang", None)
-            st.session_state.pop("fc_tts_audio", None)
-            st.rerun()
+    _render_card(client, user["id"], "fc", words_fc)
 
 with flash_random_tab:
     st.subheader("플래시카드(랜덤)")
@@ -1048,147 +1485,32 @@ with flash_random_tab:
         st.info("먼저 '세트 목록'에서 세트를 선택하세요.")
         st.stop()
 
+    if st.button("새로고침", key="fcr_refresh"):
+        _refresh_words(selected_set_id)
+
     if st.session_state.get("fcr_set_id") != selected_set_id:
         st.session_state["fcr_set_id"] = selected_set_id
         st.session_state["fcr_revealed"] = False
         st.session_state.pop("fcr_history", None)
         st.session_state.pop("fcr_pos", None)
         st.session_state.pop("fcr_index", None)
-        st.session_state.pop("fcr_tts_word_id", None)
-        st.session_state.pop("fcr_tts_lang", None)
-        st.session_state.pop("fcr_tts_audio", None)
+        st.session_state.pop("fcr_next_index", None)
+        _drop_prefetched_tts("fcr")
+        st.session_state.pop("fcr_tts", None)
         try:
-            st.session_state["fcr_words"] = list(_load_words_oldest(client, set_id=selected_set_id))
+            st.session_state["fcr_words"] = _load_word_cards(client, set_id=selected_set_id)
         except Exception as e:
             st.error(_to_error_message(e))
             st.session_state["fcr_words"] = []
     elif "fcr_words" not in st.session_state:
         try:
-            st.session_state["fcr_words"] = list(_load_words_oldest(client, set_id=selected_set_id))
+            st.session_state["fcr_words"] = _load_word_cards(client, set_id=selected_set_id)
         except Exception as e:
             st.error(_to_error_message(e))
             st.session_state["fcr_words"] = []
     words_r = st.session_state.get("fcr_words", [])
 
-    if not words_r:
-        st.info("이 세트에는 아직 단어가 없습니다.")
-        st.stop()
-
-    history = st.session_state.get("fcr_history")
-    if not isinstance(history, list) or not history:
-        start_index = secrets.randbelow(len(words_r))
-        history = [start_index]
-        st.session_state["fcr_history"] = history
-        st.session_state["fcr_pos"] = 0
-
-    fcr_pos = int(st.session_state.get("fcr_pos", 0) or 0)
-    if fcr_pos < 0:
-        fcr_pos = 0
-    if fcr_pos >= len(history):
-        fcr_pos = len(history) - 1
-    st.session_state["fcr_pos"] = fcr_pos
-
-    fcr_index = int(history[fcr_pos] or 0)
-    if fcr_index < 0:
-        fcr_index = 0
-    if fcr_index >= len(words_r):
-        fcr_index = len(words_r) - 1
-    history[fcr_pos] = fcr_index
-    st.session_state["fcr_history"] = history
-    st.session_state["fcr_index"] = fcr_index
-
-    current_r = words_r[fcr_index]
-    word_text_r = (current_r.get("word") or "").strip()
-    meaning_text_r = str(current_r.get("meaning") or "").strip()
-    pronunciation_text_r = str(current_r.get("pronunciation") or "").strip()
-    example_text_r = str(current_r.get("example") or "").strip()
-
-    st.markdown(
-        f"""
-        <div style="font-size:54px;font-weight:700;text-align:center;padding:2.5rem 0;">
-          {(word_text_r if word_text_r else "(빈 단어)")}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    user_pref = st.session_state.get("user_pref") or {}
-    saved_tts_lang = None
-    if isinstance(user_pref, dict) and user_pref.get("tts_lang"):
-        saved_tts_lang = str(user_pref.get("tts_lang"))
-    tts_lang = _guess_tts_lang(word_text_r) or (saved_tts_lang or "en")
-    current_word_id = str(current_r.get("id") or fcr_index)
-
-    active_tts_word_id = st.session_state.get("fcr_tts_word_id")
-    active_tts_audio = st.session_state.get("fcr_tts_audio")
-    active_tts_lang = st.session_state.get("fcr_tts_lang")
-    need_audio = bool(word_text_r) and not (
-        active_tts_audio and active_tts_word_id == current_word_id and active_tts_lang == tts_lang
-    )
-    if need_audio:
-        try:
-            with st.spinner("음성 준비 중..."):
-                audio_bytes = _tts_mp3_bytes(text=word_text_r, lang=tts_lang)
-            st.session_state["fcr_tts_word_id"] = current_word_id
-            st.session_state["fcr_tts_lang"] = tts_lang
-            st.session_state["fcr_tts_audio"] = audio_bytes
-            active_tts_word_id = current_word_id
-            active_tts_lang = tts_lang
-            active_tts_audio = audio_bytes
-        except Exception:
-            active_tts_audio = None
-
-    if active_tts_audio and active_tts_word_id == current_word_id and active_tts_lang == tts_lang:
-        st.audio(active_tts_audio, format="audio/mp3")
-
-    if bool(st.session_state.get("fcr_revealed", False)):
-        st.markdown(
-            f"""
-            <div style="text-align:center;padding:1rem 0;">
-              <div style="font-size:34px;font-weight:700;margin-bottom:0.75rem;">{(meaning_text_r or "")}</div>
-              <div style="font-size:28px;margin-bottom:0.5rem;">{(pronunciation_text_r or "")}</div>
-              <div style="font-size:24px;line-height:1.6;">{(example_text_r or "")}</div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    st.markdown('<div class="fcr-controls-marker"></div>', unsafe_allow_html=True)
-    col_prev_r, col_answer_r, col_next_r = st.columns(3)
-    with col_prev_r:
-        if st.button("이전", key="fcr_prev", use_container_width=True):
-            fcr_pos = int(st.session_state.get("fcr_pos", 0) or 0)
-            if fcr_pos > 0:
-                st.session_state["fcr_pos"] = fcr_pos - 1
-            st.session_state["fcr_revealed"] = False
-            st.session_state.pop("fcr_tts_word_id", None)
-            st.session_state.pop("fcr_tts_lang", None)
-            st.session_state.pop("fcr_tts_audio", None)
-            st.rerun()
-    with col_answer_r:
-        if st.button("정답", key="fcr_answer", use_container_width=True):
-            st.session_state["fcr_revealed"] = True
-            st.rerun()
-    with col_next_r:
-        if st.button("다음", key="fcr_next", use_container_width=True):
-            history = st.session_state.get("fcr_history") or []
-            fcr_pos = int(st.session_state.get("fcr_pos", 0) or 0)
-            if fcr_pos < len(history) - 1:
-                st.session_state["fcr_pos"] = fcr_pos + 1
-            else:
-                if len(words_r) <= 1:
-                    next_index = 0
-                else:
-                    r = secrets.randbelow(len(words_r) - 1)
-                    next_index = r + 1 if r >= fcr_index else r
-                history.append(next_index)
-                st.session_state["fcr_history"] = history
-                st.session_state["fcr_pos"] = len(history) - 1
-            st.session_state["fcr_revealed"] = False
-            st.session_state.pop("fcr_tts_word_id", None)
-            st.session_state.pop("fcr_tts_lang", None)
-            st.session_state.pop("fcr_tts_audio", None)
-            st.rerun()
+    _render_card(client, user["id"], "fcr", words_r)
 
 
 with diary_tab:
@@ -73,4 +73,62 @@ CREATE POLICY "Users can update their own memos" ON public.memos
     FOR UPDATE USING (auth.uid() = user_id);
 
 CREATE POLICY "Users can delete their own memos" ON public.memos
-    FOR DELETE USING (auth.uid() = user_id);
\ No newline at end of file
+    FOR DELETE USING (auth.uid() = user_id);
+
+-- TTS 음성 캐시용 Storage 버킷 (<user_id>/sha256(text|lang).mp3 로 저장)
+-- 키는 누구나 계산할 수 있으므로 사용자마다 자기 폴더만 읽고 쓰게 하고, mp3 / 1MB 로 제한한다
+INSERT INTO storage.buckets (id, name, public, file_size_limit, allowed_mime_types)
+VALUES ('tts-cache', 'tts-cache', false, 1048576, ARRAY['audio/mpeg'])
+ON CONFLICT (id) DO UPDATE
+SET file_size_limit = EXCLUDED.file_size_limit,
+    allowed_mime_types = EXCLUDED.allowed_mime_types;
+
+CREATE POLICY "Users can read their own tts cache" ON storage.objects
+    FOR SELECT TO authenticated
+    USING (bucket_id = 'tts-cache' AND (storage.foldername(name))[1] = auth.uid()::text);
+
+CREATE POLICY "Users can upload their own tts cache" ON storage.objects
+    FOR INSERT TO authenticated
+    WITH CHECK (bucket_id = 'tts-cache' AND (storage.foldername(name))[1] = auth.uid()::text);
+
+-- 첫 화면용 bootstrap 함수: 설정, 세트 목록, 마지막(없으면 최신) 세트의 단어를 한 번에 돌려준다
+-- SECURITY INVOKER 라서 위 테이블들의 RLS 가 그대로 적용된다
+CREATE OR REPLACE FUNCTION public.bootstrap()
+RETURNS json
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    WITH pref AS (
+        SELECT user_id, last_set_id, tts_lang
+        FROM public.user_prefs
+        WHERE user_id = auth.uid()
+    ),
+    sets AS (
+        SELECT id, name, description, created_at
+        FROM public.word_sets
+        WHERE user_id = auth.uid()
+    ),
+    target AS (
+        SELECT COALESCE(
+            (SELECT last_set_id FROM pref WHERE last_set_id IN (SELECT id FROM sets)),
+            (SELECT id FROM sets ORDER BY created_at DESC LIMIT 1)
+        ) AS set_id
+    )
+    SELECT json_build_object(
+        'user_pref', (SELECT row_to_json(pref) FROM pref),
+        'sets', COALESCE((SELECT json_agg(sets ORDER BY sets.created_at DESC) FROM sets), '[]'::json),
+        'words_set_id', (SELECT set_id FROM target),
+        'words', COALESCE(
+            (
+                SELECT json_agg(w ORDER BY w.created_at DESC, w.id)
+                FROM (
+                    SELECT id, word, meaning, pronunciation, example, created_at
+                    FROM public.words
+                    WHERE set_id = (SELECT set_id FROM target)
+                ) w
+            ),
+            '[]'::json
+        )
+    );
+$$;